@@ -31,12 +31,13 @@ The example will:
 - Generate a secure 256-bit AES key
 - Encrypt plaintext using AES-GCM with a unique nonce
 - Decrypt ciphertext and verify integrity using the authentication tag
+- Stream a larger input through one cipher context in 32 KiB chunks
 
 """
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.backends import default_backend
+import io
 import os
 
 # Generate a random 256-bit (32 bytes) key for AES-256
@@ -51,12 +52,14 @@ plaintext = b"Confidential data that needs to be encrypted."
 # Create AES-GCM cipher object
 aesgcm = Cipher(
     algorithms.AES(key),
-    modes.GCM(nonce),
-    backend=default_backend()
+    modes.GCM(nonce)
 ).encryptor()
 
-# Encrypt the plaintext
-ciphertext = aesgcm.update(plaintext) + aesgcm.finalize()
+# Encrypt the plaintext directly into a preallocated buffer
+# (update_into needs room for len(data) + block_size - 1 bytes; AES blocks are 16 bytes)
+buf = bytearray(len(plaintext) + 15)
+n = aesgcm.update_into(plaintext, buf)
+ciphertext = bytes(buf[:n]) + aesgcm.finalize()
 
 # Retrieve the authentication tag generated during encryption
 tag = aesgcm.tag
@@ -72,8 +75,7 @@ print(f"Tag (hex)      : {tag.hex()}")
 # Create a decryptor with the same key, nonce, and authentication tag
 decryptor = Cipher(
     algorithms.AES(key),
-    modes.GCM(nonce, tag),
-    backend=default_backend()
+    modes.GCM(nonce, tag)
 ).decryptor()
 
 # Decrypt the ciphertext
@@ -81,3 +83,92 @@ decrypted_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
 
 print("\nDecrypted plaintext:")
 print(decrypted_plaintext.decode())
+
+
+# --- Streaming encryption/decryption for large inputs ---
+
+# Each update_into() call hands a 32 KiB slab (2048 AES blocks) to OpenSSL,
+# so the per-call Python overhead is paid once per slab instead of per small piece.
+# Keep custom chunk sizes a multiple of 256 bytes (16 blocks) so OpenSSL can
+# process several AES blocks and GHASH reductions in parallel.
+CHUNK_SIZE = 1 << 15
+TAG_SIZE = 16
+
+def gcm_encrypt_stream(key, nonce, reader, writer, chunk=CHUNK_SIZE, aad_parts=()):
+    """Encrypt everything from reader into writer, then append the 16-byte tag.
+
+    aad_parts is an optional sequence of byte strings that are authenticated but not encrypted.
+
+    reader must be a binary stream with readinto() (a file opened with 'rb', io.BytesIO).
+    writer must be a buffered binary stream (a file opened with 'wb', io.BytesIO): every
+    write() has to take and copy all of the data, because the buffer passed to it is reused
+    for the next chunk.
+    """
+    encryptor = Cipher(
+        algorithms.AES(key),
+        modes.GCM(nonce)
+    ).encryptor()
+    # AAD is joined and passed in one call, so GHASH runs over all of it at once
+    if aad_parts:
+        encryptor.authenticate_additional_data(b"".join(aad_parts))
+    # One input buffer and one output buffer are reused for every chunk
+    inbuf = bytearray(chunk)
+    inview = memoryview(inbuf)
+    buf = bytearray(chunk + 15)
+    view = memoryview(buf)
+    while got := reader.readinto(inbuf):
+        n = encryptor.update_into(inview[:got], buf)
+        writer.write(view[:n])
+    writer.write(encryptor.finalize() + encryptor.tag)
+
+def gcm_decrypt_stream(key, nonce, reader, writer, chunk=CHUNK_SIZE, aad_parts=()):
+    """Decrypt a stream written by gcm_encrypt_stream, checking the trailing tag.
+
+    aad_parts must hold the same additional data that was given when encrypting.
+    reader and writer have the same requirements as in gcm_encrypt_stream.
+
+    Plaintext is written to writer before the tag at the end can be checked. If this raises
+    InvalidTag, everything written so far is unauthenticated and must be discarded.
+    """
+    decryptor = Cipher(
+        algorithms.AES(key),
+        modes.GCM(nonce)
+    ).decryptor()
+    if aad_parts:
+        decryptor.authenticate_additional_data(b"".join(aad_parts))
+    buf = bytearray(chunk + 15)
+    view = memoryview(buf)
+    # Input is read into one buffer; its first `held` bytes are the tail of the previous read,
+    # kept back because the last 16 bytes of the stream are the tag, not ciphertext
+    inbuf = bytearray(TAG_SIZE + chunk)
+    inview = memoryview(inbuf)
+    held = 0
+    while got := reader.readinto(inview[held:]):
+        total = held + got
+        if total <= TAG_SIZE:
+            held = total
+            continue
+        n = decryptor.update_into(inview[:total - TAG_SIZE], buf)
+        writer.write(view[:n])
+        inbuf[:TAG_SIZE] = inbuf[total - TAG_SIZE:total]  # carry the 16-byte tail
+        held = TAG_SIZE
+    if held != TAG_SIZE:
+        raise ValueError("Ciphertext stream is too short to contain an authentication tag.")
+    # Raises InvalidTag if the data or the tag was altered
+    writer.write(decryptor.finalize_with_tag(bytes(inbuf[:TAG_SIZE])))
+
+large_plaintext = os.urandom(1 << 20)  # 1 MiB of data
+stream_nonce = os.urandom(12)          # never reuse a nonce with the same key
+# Header fields sent in the clear but protected by the tag
+header = [b"file=backup.bin;", b"version=1;"]
+
+encrypted_stream = io.BytesIO()
+gcm_encrypt_stream(key, stream_nonce, io.BytesIO(large_plaintext), encrypted_stream, aad_parts=header)
+
+decrypted_stream = io.BytesIO()
+encrypted_stream.seek(0)
+gcm_decrypt_stream(key, stream_nonce, encrypted_stream, decrypted_stream, aad_parts=header)
+
+print("\nStreaming AES-GCM on 1 MiB of data")
+print(f"Ciphertext + tag size: {len(encrypted_stream.getvalue())} bytes")
+print(f"Round trip successful? {decrypted_stream.getvalue() == large_plaintext}")
@@ -21,18 +21,48 @@ An eavesdropper can see these "mixed" public values (X and Y) but cannot easily
 Both of their calculations result in the same final key, k = k' = g^{xy} mod n. The security of the protocol relies on the fact that only Alice and Bob have their private secrets (x and y) to perform the final calculation.
 
 """
-import random as rnd
+from secrets import randbelow
+
+# Below this bound, Miller-Rabin with the primes 2..41 as witnesses never accepts a composite
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+RANDOM_ROUNDS = 40  # extra random witnesses above the bound; error probability <= 4^-40
 
 def is_prime(num):
     """
-    Checks if a number is prime.
-    A number is prime if it's greater than 1 and has no divisors other than 1 and itself.
+    Checks if a number is prime using the Miller-Rabin test.
+    With the first thirteen primes (2..41) as witnesses the result is exact for every num
+    below 3.317 * 10^24. Larger inputs also get random witnesses: fixed bases alone are only
+    a probable-prime test there, and someone choosing p can build composites that pass them.
     """
-    if num <= 1:
+    if num < 2:
         return False
-    # Check for divisibility from 2 up to the square root of the number
-    for i in range(2, int(num**0.5) + 1):
-        if num % i == 0:
+    # Small primes (and their multiples) are settled right away
+    for p in WITNESSES:
+        if num % p == 0:
+            return num == p
+
+    # Write num - 1 as d * 2^s with d odd
+    d = num - 1
+    s = 0
+    while d % 2 == 0:
+        d >>= 1
+        s += 1
+
+    witnesses = list(WITNESSES)
+    if num >= DETERMINISTIC_LIMIT:
+        witnesses += [2 + randbelow(num - 3) for _ in range(RANDOM_ROUNDS)]
+
+    for a in witnesses:
+        x = pow(a, d, num)
+        if x == 1 or x == num - 1:
+            continue
+        # Square up to s-1 times looking for num - 1
+        for _ in range(s - 1):
+            x = pow(x, 2, num)
+            if x == num - 1:
+                break
+        else:
             return False
     return True
 
@@ -45,23 +75,24 @@ def dhkep(g, p):
         print(f"Error: {p} is not a prime number.")
         return
 
+    # Secret keys are drawn from the OS CSPRNG, uniformly in [2, p - 1]
     # Alice's secret key
-    a = rnd.randint(2, p - 1)
+    a = 2 + randbelow(p - 2)
     # Bob's secret key
-    b = rnd.randint(2, p - 1)
+    b = 2 + randbelow(p - 2)
 
     # Alice's public key (A)
-    # Note: Use a double asterisk (**) for exponentiation
-    A = (g ** a) % p
+    # Note: pow(base, exp, mod) reduces modulo p at every step instead of building g**a first
+    A = pow(g, a, p)
 
     # Bob's public key (B)
-    B = (g ** b) % p
+    B = pow(g, b, p)
 
     # Alice computes the shared secret key
-    key1 = (B ** a) % p
+    key1 = pow(B, a, p)
 
     # Bob computes the shared secret key
-    key2 = (A ** b) % p
+    key2 = pow(A, b, p)
 
     print(f"Alice's private key: {a}")
     print(f"Bob's private key: {b}")
@@ -45,40 +45,65 @@ m(c) = c ^ d mod n = 2790 ^ 413 mod 3233 = 65
 """
 
 
-import random, math, sys, codecs
-
-# Configure output encoding to UTF-16 for better Unicode handling in some environments
-sys.stdout = codecs.getwriter('utf_16')(sys.stdout.buffer, 'strict')
-
-# --- Check if a number is prime ---
-def prime(num):
-    if num == 1:
-        return False
-    elif num == 2:
-        return True
-    # Trial division: check divisibility from 2 up to num-1
-    for i in range(2, num):
-        if num % i == 0:
-            return False
-    return True
+import random, math
+
+# --- Build a table of primes up to a limit ---
+def prime_sieve(limit):
+    # Sieve of Eratosthenes: sieve[i] is 1 if i is prime, 0 otherwise
+    sieve = bytearray(b'\x01') * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, int(limit**0.5) + 1):
+        if sieve[i]:
+            # Cross out every multiple of i starting at i*i
+            sieve[i*i::i] = b'\x00' * len(sieve[i*i::i])
+    return sieve
+
+# --- Block size: how many message bytes fit in one number below n ---
+def block_size(n):
+    return (n.bit_length() - 1) // 8
 
 # --- RSA Encryption ---
 def encrypt(msg, n, e):
-    msg = [ord(i) ** e % n for i in list(msg)]
-    return ' '.join(map(str, msg))  # return space-separated ciphertext numbers
+    # Pack several UTF-8 bytes into each block so there is one modexp per block, not per character
+    k = block_size(n)
+    data = msg.encode()
+    # Pad with 0x80 then zero bytes up to a multiple of k, so every block is exactly k bytes
+    # and NUL characters anywhere in the message survive the round trip
+    data += b'\x80' + b'\x00' * (-(len(data) + 1) % k)
+    blocks = [int.from_bytes(data[i:i+k], 'big') for i in range(0, len(data), k)]
+    return ' '.join(str(pow(m, e, n)) for m in blocks)  # return space-separated ciphertext numbers
 
 # --- RSA Decryption ---
-def decrypt(msg, n, d):
-    msg = [chr((int(i) ** d) % n) for i in msg.split()]
-    return ''.join(msg)
+def decrypt(msg, n, d, crt=None):
+    k = block_size(n)
+    width = (n.bit_length() + 7) // 8  # bytes needed for any value below n
+    data = []
+    for i in msg.split():
+        c = int(i)
+        if crt is None:
+            m = pow(c, d, n)
+        else:
+            # Chinese Remainder Theorem: two half-size exponentiations mod p and mod q
+            p, q, dp, dq, qinv = crt
+            m1 = pow(c, dp, p)
+            m2 = pow(c, dq, q)
+            h = (qinv * (m1 - m2)) % p
+            m = m2 + h * q
+        # With the right key every block fits in k bytes; with the wrong key m can be larger
+        data.append(m.to_bytes(k if m.bit_length() <= 8 * k else width, 'big'))
+    data = b''.join(data).rstrip(b'\x00')
+    if data.endswith(b'\x80'):
+        data = data[:-1]  # remove the padding marker
+    # errors='replace' keeps the output printable when the wrong key is used
+    return data.decode(errors='replace')
 
 # --- RSA Key Generation ---
 print("\n=== RSA Key Generation ===")
 
 # Step 1: Generate primes
-prime_list = list(i for i in range(127, 500+1) if prime(i) )# Note: In real applications, use much larger primes for security
-p = random.choice(prime_list)
-q = random.choice(prime_list)
+sieve = prime_sieve(500)
+prime_list = [i for i in range(127, 500+1) if sieve[i]]  # Note: In real applications, use much larger primes for security
+p, q = random.sample(prime_list, 2)  # p and q must be distinct
 print(f"Prime p: {p}")
 print(f"Prime q: {q}")
 
@@ -91,13 +116,14 @@ phi_n = (p - 1) * (q - 1)
 print(f"phi(n) = (p-1)*(q-1) = ({p}-1)*({q}-1) = {phi_n}")
 
 # Step 4: Choose public exponent e
-e = random.choice([i for i in range(2, n) if math.gcd(i, phi_n) == 1])
+# Start from the common choice 65537 (or 3 if phi(n) is too small) and step through odd values until coprime
+e = 65537 if 65537 < phi_n else 3
+while math.gcd(e, phi_n) != 1:
+    e += 2
 print(f"Public exponent e chosen: {e} (coprime with phi(n))")
 
-# Step 5: Compute private exponent d
-d = 1
-while (e * d) % phi_n != 1:
-    d += 1
+# Step 5: Compute private exponent d (modular inverse of e modulo phi(n), via extended Euclid)
+d = pow(e, -1, phi_n)
 print(f"Private exponent d calculated: {d}")
 
 # Step 6: Define public and private key pairs
@@ -106,6 +132,14 @@ private_key = (n, d)
 print(f"Public key: {public_key}")
 print(f"Private key: {private_key}")
 
+# Step 7: Precompute CRT parameters so the private key holder can decrypt faster
+dp = d % (p - 1)
+dq = d % (q - 1)
+qinv = pow(q, -1, p)
+crt_params = (p, q, dp, dq, qinv)
+print(f"CRT parameters: dp = {dp}, dq = {dq}, qinv = {qinv}")
+print(f"Block size: {block_size(n)} byte(s) of the message per ciphertext number")
+
 # --- Encryption & Decryption Demo ---
 print("\n=== Encryption & Decryption Demo ===")
 msg = input("Enter a message: ") or 'Some message'
@@ -117,7 +151,7 @@ encrypted = encrypt(msg, *public_key)
 print(f"Encrypted ciphertext: {encrypted}")
 
 # Decrypt with private key
-decrypted = decrypt(encrypted, *private_key)
+decrypted = decrypt(encrypted, *private_key, crt_params)
 print(f"Decrypted with private key: {decrypted}")
 print(f"Decryption successful? {decrypted == msg}")
 
@@ -37,24 +37,16 @@ Because of that, we reduce the hash modulo n before signing and verifying.
 This keeps the demo correct for small numbers but is NOT secure in practice.
 """
 
+import functools
 import hashlib
+import hmac
+from math import gcd
 
 # RSA HELPER FUNCTIONS (Simplified for Demonstration)
 
-def gcd(a, b):
-    """Greatest Common Divisor using Euclidean Algorithm."""
-    while b:
-        a, b = b, a % b
-    return a
-
 def modinv(a, m):
-    """Find modular inverse of a under modulo m (Extended Euclidean Algorithm)."""
-    m0, x0, x1 = m, 0, 1
-    while a > 1:
-        q = a // m
-        a, m = m, a % m
-        x0, x1 = x1 - q * x0, x0
-    return x1 + m0 if x1 < 0 else x1
+    """Find modular inverse of a under modulo m (Extended Euclidean Algorithm, built into pow)."""
+    return pow(a, -1, m)
 
 def generate_keypair(p, q):
     """Generate RSA keypair from two primes p and q."""
@@ -69,28 +61,53 @@ def generate_keypair(p, q):
             e += 2
 
     d = modinv(e, phi)
-    return (e, n), (d, n)  # (public_key, private_key)
 
-def sign(msg, private_key):
-    """Create a digital signature:
-    - Hash the message with SHA-256
-    - Reduce hash modulo n (for demo with small n)
-    - Encrypt with private key
-    """
-    d, n = private_key
-    msg_hash = int.from_bytes(hashlib.sha256(msg.encode()).digest(), 'big') % n
-    return pow(msg_hash, d, n)
+    # CRT parameters let the private key holder work mod p and mod q separately
+    dp = d % (p - 1)
+    dq = d % (q - 1)
+    qinv = modinv(q, p)
 
-def verify(msg, signature, public_key):
-    """Verify a digital signature:
-    - Hash the message again and reduce modulo n
+    public_key = (e, n)
+    private_key = (d, n, p, q, dp, dq, qinv)
+    return public_key, private_key
+
+def sign_digest(digest, private_key):
+    """Create a digital signature from a precomputed SHA-256 digest:
+    - Reduce the digest modulo n (for demo with small n)
+    - Encrypt with private key, using the Chinese Remainder Theorem
+      (two half-size exponentiations mod p and mod q instead of one mod n)
+    """
+    d, n, p, q, dp, dq, qinv = private_key
+    msg_hash = int.from_bytes(digest, 'big') % n
+    m1 = pow(msg_hash, dp, p)
+    m2 = pow(msg_hash, dq, q)
+    h = (qinv * (m1 - m2)) % p
+    return m2 + h * q
+
+def verify_digest(digest, signature, public_key):
+    """Verify a digital signature against a precomputed SHA-256 digest:
+    - Reduce the digest modulo n
     - Decrypt signature with public key
-    - Compare values
+    - Compare values in constant time, as fixed-width byte strings
     """
     e, n = public_key
-    msg_hash = int.from_bytes(hashlib.sha256(msg.encode()).digest(), 'big') % n
+    msg_hash = int.from_bytes(digest, 'big') % n
     hash_from_sig = pow(signature, e, n)
-    return msg_hash == hash_from_sig
+    width = (n.bit_length() + 7) // 8
+    return hmac.compare_digest(msg_hash.to_bytes(width, 'big'), hash_from_sig.to_bytes(width, 'big'))
+
+@functools.lru_cache(maxsize=128)
+def _h(msg):
+    """SHA-256 digest of a message, cached so a verify right after a sign does not hash again."""
+    return hashlib.sha256(msg.encode()).digest()
+
+def sign(msg, private_key):
+    """Hash the message with SHA-256 and sign the digest."""
+    return sign_digest(_h(msg), private_key)
+
+def verify(msg, signature, public_key):
+    """Hash the message with SHA-256 (cached) and verify the signature."""
+    return verify_digest(_h(msg), signature, public_key)
 
 # DEMONSTRATION OF DIGITAL SIGNATURES
 
@@ -109,6 +126,7 @@ print("Message:", message)
 print("Signature:", signature)
 
 # Step 4: Bob verifies the signature using Alice’s public key
+# The digest computed while signing is cached, so the message is not hashed again
 is_authentic = verify(message, signature, alice_public)
 
 print("\nBob verifies the signature...")
@@ -1,6 +1,30 @@
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import hashes, serialization
 import base64
+import os
+
+# Key generation is the slow part of these demos (two large primes have to be found),
+# so the key is saved as PEM on the first run and loaded from disk afterwards.
+# NOTE: the file is not password protected; this is only acceptable for a demo.
+def load_or_generate_private_key(filename):
+    """Load an RSA private key from a PEM file next to this script, generating and saving it if missing."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return serialization.load_pem_private_key(f.read(), password=None)
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,   # Commonly used RSA public exponent
+        key_size=2048            # 2048-bit RSA key (considered secure today)
+    )
+    # Create the file readable by its owner only (0600); O_EXCL refuses to reuse an existing file
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+    return private_key
 
 
 # PART 2 — DIGITAL SIGNATURE/VERIFICATION
@@ -20,10 +44,7 @@ message = b"Hello Bob, this is a secret from Alice!"
 
 # Step 2: Alice generates her RSA key pair
 # Alice keeps her PRIVATE key secret and shares her PUBLIC key for verification.
-alice_private_key = rsa.generate_private_key(
-    public_exponent=65537,
-    key_size=2048
-)
+alice_private_key = load_or_generate_private_key("alice.pem")
 alice_public_key = alice_private_key.public_key()
 
 # Step 3: Alice signs the message
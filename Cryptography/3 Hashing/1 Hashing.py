@@ -46,33 +46,31 @@ import hmac
 
 input_data = b"Hello World"
 
-# MD5 - Legacy hash function, fast but insecure for cryptographic use
-md5_hash = hashlib.md5(input_data).hexdigest()
-print(f"MD5       : {md5_hash}")
-
-# SHA-1 - Older standard, vulnerabilities discovered, avoid for security-critical use
-sha1_hash = hashlib.sha1(input_data).hexdigest()
-print(f"SHA-1     : {sha1_hash}")
-
-# SHA-256 - Strong and widely used, recommended for most security applications
-sha256_hash = hashlib.sha256(input_data).hexdigest()
-print(f"SHA-256   : {sha256_hash}")
-
-# SHA-512 - Part of SHA-2 family, outputs longer hash, suitable for high-security needs
-sha512_hash = hashlib.sha512(input_data).hexdigest()
-print(f"SHA-512   : {sha512_hash}")
-
-# SHA3-256 - Newer standard designed to be resistant to length-extension attacks
-sha3_256_hash = hashlib.sha3_256(input_data).hexdigest()
-print(f"SHA3-256  : {sha3_256_hash}")
-
-# SHA3-512 - Like SHA3-256 but with longer output and increased security margin
-sha3_512_hash = hashlib.sha3_512(input_data).hexdigest()
-print(f"SHA3-512  : {sha3_512_hash}")
+# Every algorithm reads the same buffer through one memoryview, so the data is never copied
+input_view = memoryview(input_data)
+
+ALGORITHMS = [
+    # MD5 - Legacy hash function, fast but insecure for cryptographic use
+    ("md5", "MD5"),
+    # SHA-1 - Older standard, vulnerabilities discovered, avoid for security-critical use
+    ("sha1", "SHA-1"),
+    # SHA-256 - Strong and widely used, recommended for most security applications
+    ("sha256", "SHA-256"),
+    # SHA-512 - Part of SHA-2 family, outputs longer hash, suitable for high-security needs
+    ("sha512", "SHA-512"),
+    # SHA3-256 - Newer standard designed to be resistant to length-extension attacks
+    ("sha3_256", "SHA3-256"),
+    # SHA3-512 - Like SHA3-256 but with longer output and increased security margin
+    ("sha3_512", "SHA3-512"),
+]
+
+results = {name: hashlib.new(name, input_view).hexdigest() for name, _ in ALGORITHMS}
+for name, label in ALGORITHMS:
+    print(f"{label:<10}: {results[name]}")
 
 # Ensure all hashes are unique for the same input across different algorithms
-hashes = {md5_hash, sha1_hash, sha256_hash, sha512_hash, sha3_256_hash, sha3_512_hash}
-assert len(hashes) == 6, "Hashes should all be unique for different algorithms."
+hashes = set(results.values())
+assert len(hashes) == len(ALGORITHMS), "Hashes should all be unique for different algorithms."
 
 
 # Example: How to verify a received hash to ensure data integrity
@@ -14,11 +14,16 @@ hashlib library, supporting different hashing algorithms such as SHA-256, SHA-1,
 
 import hashlib
 
+CHUNK_SIZE = 1 << 20  # 1 MiB per read keeps the number of update() calls low
+
 def hash_file(filename, algorithm='sha256'):
     hash_func = hashlib.new(algorithm)
     with open(filename, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            hash_func.update(chunk)
+        # Read into one reusable buffer instead of a new bytes object per chunk
+        buf = bytearray(CHUNK_SIZE)
+        view = memoryview(buf)
+        while size := f.readinto(buf):
+            hash_func.update(view[:size])
     return hash_func.hexdigest()
 
 # Example usage:
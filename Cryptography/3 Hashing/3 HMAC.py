@@ -23,13 +23,22 @@ key = b'super_secret_key'
 # Message whose integrity we want to protect
 message = b'Important message'
 
+# Key the HMAC once: this pads the key and hashes (key XOR ipad) and (key XOR opad).
+# Every message then starts from a copy of that state instead of repeating the key setup.
+hmac_proto = hmac.new(key, digestmod=hashlib.sha256)
+
+def compute_hmac(msg):
+    h = hmac_proto.copy()
+    h.update(msg)
+    return h.hexdigest()
+
 # Generate HMAC using SHA-256
-hmac_hash = hmac.new(key, message, hashlib.sha256).hexdigest()
+hmac_hash = compute_hmac(message)
 print(f"HMAC-SHA256: {hmac_hash}")
 
 # Simulate message verification by regenerating the HMAC
 received_hmac = hmac_hash
-expected_hmac = hmac.new(key, message, hashlib.sha256).hexdigest()
+expected_hmac = compute_hmac(message)
 
 # Use constant-time comparison to prevent timing attacks
 if hmac.compare_digest(received_hmac, expected_hmac):
@@ -13,7 +13,7 @@ This script demonstrates a secure approach to storing passwords by combining:
 
 - Hash Function: A cryptographic one-way function (such as SHA-256 or SHA-512 in this educational example) 
   used to transform the salted and peppered password into a fixed-size digest. In real-world applications, 
-  specialized password hashing algorithms such as bcrypt, scrypt, or Argon2 are preferred due to their resistance 
+  specialized password hashing algorithms such as Argon2, scrypt, or bcrypt are preferred due to their resistance 
   to brute-force and GPU-based attacks.
 
 Why this matters:
@@ -30,72 +30,391 @@ well-established password hashing libraries (e.g., bcrypt, scrypt, or Argon2), w
 salting and cost factors to slow down brute-force attempts.
 """
 
+from __future__ import annotations
+
+import concurrent.futures
+import functools
 import hashlib
 import os
 import hmac
-import bcrypt  # Requires: pip install bcrypt
+import secrets
+import time
+import warnings
+
+try:
+    import ssl
+except ImportError:  # Python built without OpenSSL
+    ssl = None
+
+try:
+    import _fastpw  # Optional C accelerator, build it from _fastpw.c
+except ImportError:
+    _fastpw = None
 
 
 PEPPER = b'supersecretpepper'  # In practice, store securely outside code
+DIGEST_SIZE = hashlib.sha256().digest_size  # 32 bytes
+
+
+def calibrate_bcrypt_rounds(budget: float = 0.25, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Picks the largest bcrypt cost factor whose hash takes at most `budget` seconds on this machine.
+
+    Each extra round doubles the work, so the search stops at the first cost over budget.
+    It never goes below `min_rounds`, even on slow hardware.
+    """
+    import bcrypt  # Imported here so hash_password users do not load bcrypt's native library
+
+    rounds = min_rounds
+    for candidate in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(candidate))
+        if time.perf_counter() - start > budget:
+            break
+        rounds = candidate
+    return rounds
+
+
+def cpu_has_sha_extensions():
+    """
+    Checks whether the CPU advertises SHA-256 instructions (x86 SHA-NI or ARMv8 SHA2).
+    Returns None when this cannot be determined (e.g., no /proc/cpuinfo outside Linux).
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith(('flags', 'Features')):
+                    flags = line.split(':', 1)[-1].split()
+                    return 'sha_ni' in flags or 'sha2' in flags
+    except OSError:
+        pass
+    return None
+
+
+def _check_sha256_backend():
+    """
+    Warns once if SHA-256 is likely running without hardware acceleration.
+
+    hashlib.sha256 uses OpenSSL when available, and OpenSSL >= 1.1.1 picks the SHA-NI
+    code path at runtime on CPUs that support it. Python's built-in fallback and older
+    OpenSSL builds do not. To fix it, rebuild Python against a recent OpenSSL.
+    """
+    if hashlib.sha256.__name__ != 'openssl_sha256':
+        warnings.warn("hashlib.sha256 is not backed by OpenSSL; SHA-256 will not use "
+                      "SHA-NI. Rebuild Python against OpenSSL >= 1.1.1.")
+    elif ssl is not None and ssl.OPENSSL_VERSION_INFO < (1, 1, 1):
+        warnings.warn(f"{ssl.OPENSSL_VERSION} predates SHA-NI support; "
+                      "rebuild Python against OpenSSL >= 1.1.1.")
+    elif cpu_has_sha_extensions() is False:
+        warnings.warn("This CPU does not report SHA extensions; SHA-256 runs on the "
+                      "scalar code path.")
+
+
+def generate_salt(length: int = 16) -> bytes:
+    """
+    Generates a cryptographically secure random salt as raw bytes.
+    Hex-encode it (salt.hex()) only when storing or displaying it.
+    """
+    return secrets.token_bytes(length)
 
 
-def generate_salt(length: int = 16) -> str:
-    """Generates a cryptographically secure random salt."""
-    return os.urandom(length).hex()
+@functools.lru_cache(maxsize=8)
+def _sha_prefix(pepper: bytes):
+    """
+    Returns a SHA-256 object that has already absorbed the pepper, built once per pepper.
+    Callers copy() it and feed only the salt and password.
+
+    A plain pepper prefix needs one SHA-256 pass, while HMAC needs two. HMAC is only
+    required if length-extension resistance matters, which it does not for this
+    educational scheme.
+    """
+    return hashlib.sha256(pepper)
+
+
+@functools.lru_cache(maxsize=4096)
+def _salt_bytes(salt_hex: str) -> bytes:
+    """
+    Decodes a hex salt as read back from storage. Cached because the same user's salt
+    is verified over and over under a login storm; maxsize bounds the memory used.
+    """
+    return bytes.fromhex(salt_hex)
+
+
+def _hash_raw(password_bytes: bytes, salt: bytes, proto) -> bytes:
+    """
+    Core hash on already-encoded inputs: copies the pepper prototype and feeds salt, then password.
+    The public wrappers encode the password exactly once before calling this.
+    """
+    h = proto.copy()
+    # Two update() calls give the same digest as hashing salt + password, without building
+    # the concatenation: SHA-256 buffers input internally, so how it is split does not matter.
+    h.update(salt)
+    h.update(password_bytes)
+    return h.digest()
 
 
-def hash_password(password: str, salt: str, pepper: bytes) -> str:
+def _digest(password_bytes: bytes, salt: bytes, pepper: bytes) -> bytes:
+    """Hashes pepper + salt + password in one C call when _fastpw is built, else via hashlib."""
+    if _fastpw is not None:
+        return _fastpw.hash(pepper, salt, password_bytes)
+    return _hash_raw(password_bytes, salt, _sha_prefix(pepper))
+
+
+def hash_password(password: str, salt: bytes | str, pepper: bytes) -> bytes:
     """
-    Hashes the password using SHA-256, with salt and pepper.
+    Hashes the password using SHA-256 over pepper + salt + password.
 
     Parameters:
     - password: User password as string
-    - salt: Unique salt for this password (hex string)
+    - salt: Unique salt for this password (raw bytes, or hex string as stored)
     - pepper: Secret value added to all passwords (bytes)
 
     Returns:
-    - Hexadecimal digest of hash
+    - Raw 32-byte digest of hash (use hash_password_hex for display or text storage)
     """
-    combined = (salt + password).encode('utf-8')
-    return hmac.new(pepper, combined, hashlib.sha256).hexdigest()
+    if isinstance(salt, str):
+        salt = _salt_bytes(salt)
+    return _digest(password.encode('utf-8'), salt, pepper)
+
 
+def hash_password_hex(password: str, salt: bytes | str, pepper: bytes) -> str:
+    """Same as hash_password, but returns the digest as a hexadecimal string."""
+    return hash_password(password, salt, pepper).hex()
 
-def verify_password(input_password: str, stored_salt: str, stored_hash: str, pepper: bytes) -> bool:
+
+def verify_password(input_password: str, stored_salt: bytes | str, stored_hash: bytes | str, pepper: bytes) -> bool:
     """
     Verifies a password by recomputing the hash and comparing to stored hash.
+    Both digests are compared as raw bytes (32 bytes instead of 64 hex characters).
+    stored_salt may be raw bytes or the hex string kept in the database.
+
+    stored_hash may be the raw digest bytes or the hex string kept in the database.
+    Malformed values are still compared, against a zero digest of the right length, so
+    compare_digest never takes its early length exit and the timing does not depend on
+    what was stored.
     """
-    recomputed_hash = hash_password(input_password, stored_salt, pepper)
-    return hmac.compare_digest(recomputed_hash, stored_hash)
+    return _check(input_password.encode('utf-8'), stored_salt, stored_hash, pepper)
+
+
+def _expected_digest(stored_hash: bytes | str) -> tuple[bytes, bool]:
+    """
+    Validates a stored hash before comparing. Accepts the raw digest or its 64-character hex
+    form (as returned by hash_password_hex). Returns (expected, length_ok), where expected
+    always has DIGEST_SIZE bytes: a zero digest stands in for a malformed value.
+    """
+    if isinstance(stored_hash, str):
+        try:
+            stored_hash = bytes.fromhex(stored_hash) if len(stored_hash) == 2 * DIGEST_SIZE else b''
+        except ValueError:  # not valid hex
+            stored_hash = b''
+    elif not isinstance(stored_hash, (bytes, bytearray)):
+        raise TypeError("stored_hash must be the digest from hash_password() (bytes) or hash_password_hex() (str)")
+    length_ok = len(stored_hash) == DIGEST_SIZE
+    return (stored_hash if length_ok else bytes(DIGEST_SIZE)), length_ok
+
+
+def _check(password_bytes: bytes, stored_salt: bytes | str, stored_hash: bytes | str, pepper: bytes) -> bool:
+    """Shared body of verify_password and verify_any, on an already-encoded password."""
+    expected, length_ok = _expected_digest(stored_hash)
+    if isinstance(stored_salt, str):
+        stored_salt = _salt_bytes(stored_salt)
+    recomputed_hash = _digest(password_bytes, stored_salt, pepper)
+    return hmac.compare_digest(recomputed_hash, expected) and length_ok
+
+
+def verify_any(password: str, entries: list[tuple[bytes | str, bytes | str]], pepper: bytes) -> bool:
+    """
+    Checks a password against several stored (salt, hash) entries, e.g., the current hash
+    plus older ones for a password-reuse policy. Returns True if any entry matches.
+    The password is UTF-8 encoded once for all entries.
+    """
+    password_bytes = password.encode('utf-8')
+    for stored_salt, stored_hash in entries:
+        if _check(password_bytes, stored_salt, stored_hash, pepper):
+            return True
+    return False
+
+
+def verify_batch(attempts: list[tuple[str, bytes | str, bytes | str]], pepper: bytes, workers: int | None = None) -> list[bool]:
+    """
+    Verifies many (password, salt, hash) tuples on a thread pool, e.g., for offline audits.
+    Results are returned in the same order as the attempts.
+
+    The attempts are split into one slice per worker and each task loops over its slice,
+    so the thread pool overhead is paid once per worker instead of once per attempt.
+    Threads only run in parallel while a hash is in C code that releases the GIL (hashlib
+    updates of 2 KiB or more, bcrypt, argon2). A salted SHA-256 of a short password spends
+    most of its time in Python, so expect about the speed of a plain loop.
+    """
+    if not attempts:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(attempts))
+    step = -(-len(attempts) // workers)  # ceiling division
+    slices = [attempts[i:i + step] for i in range(0, len(attempts), step)]
+
+    def check_slice(items):
+        return [verify_password(password, salt, stored, pepper) for password, salt, stored in items]
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as ex:
+        return [ok for results in ex.map(check_slice, slices) for ok in results]
+
+
+def verify_candidates(stored_salt: bytes | str, stored_hash: bytes | str, candidates: list[str], pepper: bytes) -> str | None:
+    """
+    Checks many candidate passwords against one stored (salt, hash), e.g., when auditing a
+    user's hash against a breach list. Returns the first matching candidate, or None.
+
+    The SHA-256 state after pepper + salt is computed once and copied per candidate, so each
+    check only hashes the candidate itself. SIMD multi-buffer SHA-256 libraries (ISA-L,
+    intel-ipsec-mb) are not used; with _fastpw built, each candidate is one C call instead.
+    stored_hash is validated like in verify_password.
+    """
+    expected, length_ok = _expected_digest(stored_hash)
+    if isinstance(stored_salt, str):
+        stored_salt = _salt_bytes(stored_salt)
+    if _fastpw is not None:
+        def digest_of(pw):
+            return _fastpw.hash(pepper, stored_salt, pw)
+    else:
+        base = _sha_prefix(pepper).copy()
+        base.update(stored_salt)
+
+        def digest_of(pw):
+            h = base.copy()
+            h.update(pw)
+            return h.digest()
+
+    for candidate in candidates:
+        if hmac.compare_digest(digest_of(candidate.encode('utf-8')), expected) and length_ok:
+            return candidate
+    return None
+
+
+def run_benchmark(bcrypt_rounds: int, repeat: int = 5) -> None:
+    """
+    Times the hashing functions with timeit and prints the best ns/op of `repeat` runs.
+    The SHA-256 paths run 100,000 times per measurement. bcrypt is slow on purpose,
+    so it only runs a few times.
+    """
+    import timeit
+    import bcrypt  # Requires: pip install bcrypt
+
+    password = "CorrectHorseBatteryStaple"
+    salt = generate_salt()
+    digest = hash_password(password, salt, PEPPER)
+    bcrypt_password = password.encode('utf-8')
+    bcrypt_hash = bcrypt.hashpw(bcrypt_password, bcrypt.gensalt(bcrypt_rounds))
+
+    cases = [
+        ("hash_password", lambda: hash_password(password, salt, PEPPER), 100_000),
+        ("verify_password", lambda: verify_password(password, salt, digest, PEPPER), 100_000),
+        (f"bcrypt.hashpw ({bcrypt_rounds} rounds)", lambda: bcrypt.hashpw(bcrypt_password, bcrypt.gensalt(bcrypt_rounds)), 3),
+        (f"bcrypt.checkpw ({bcrypt_rounds} rounds)", lambda: bcrypt.checkpw(bcrypt_password, bcrypt_hash), 3),
+    ]
+    print(f"=== Benchmark (best of {repeat}, C accelerator: {'on' if _fastpw else 'off'}) ===")
+    for name, func, number in cases:
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        print(f"{name:<28}: {best / number * 1e9:>15,.0f} ns/op")
+
+
+def run_demo(bcrypt_rounds: int) -> None:
+    """Walks through hashing, verifying and auditing passwords, then Argon2id and bcrypt."""
+    # --- Example: Hashing a Password ---
+
+    print("=== SHA-256 Hashing with Salt + Pepper ===")
+    user_password = "CorrectHorseBatteryStaple"
+    salt = generate_salt()
+    hash_digest = hash_password(user_password, salt, PEPPER)
+
+    print(f"Password   : {user_password}")
+    print(f"Salt       : {salt.hex()}")  # hex only for storage/display
+    print(f"Hash (SHA) : {hash_digest.hex()}")
+
+    # --- Example: Verifying Password ---
+
+    print("\n=== Verifying the Password ===")
+    input_attempt = "CorrectHorseBatteryStaple"  # Same as original password
+    stored_salt = salt.hex()  # the salt as it would be read back from the database
+    is_valid = verify_password(input_attempt, stored_salt, hash_digest, PEPPER)
+    print("Password valid!" if is_valid else "Invalid password!")
+
+    # --- Example: Verifying a Batch of Attempts ---
+
+    print("\n=== Verifying a Batch of Attempts ===")
+    attempts = [(guess, salt, hash_digest) for guess in ("password123", "CorrectHorseBatteryStaple", "letmein")]
+    for (guess, _, _), ok in zip(attempts, verify_batch(attempts, PEPPER)):
+        print(f"{guess:<26}: {'valid' if ok else 'invalid'}")
+
+    # --- Example: Checking a New Password Against Previous Ones ---
+
+    print("\n=== Password Reuse Check ===")
+    old_salt = generate_salt()
+    history = [(salt.hex(), hash_digest), (old_salt.hex(), hash_password("Spring2023!", old_salt, PEPPER))]
+    for new_password in ("Spring2023!", "Autumn2025?"):
+        reused = verify_any(new_password, history, PEPPER)
+        print(f"{new_password:<12}: {'already used' if reused else 'not used before'}")
+
+    # --- Example: Auditing One Hash Against a Candidate List ---
+
+    print("\n=== Auditing Against Known Passwords ===")
+    breach_list = ["123456", "qwerty", "CorrectHorseBatteryStaple", "iloveyou"]
+    match = verify_candidates(salt, hash_digest, breach_list, PEPPER)
+    print(f"Password found in list: {match}" if match else "Password not found in list.")
+
+    # --- BONUS: Secure Hashing with Argon2id (Recommended) ---
+
+    # Argon2id is memory-hard: each guess needs 64 MiB of RAM here, which removes most of the
+    # advantage GPUs have over a server CPU. bcrypt only costs CPU time.
+    from argon2 import PasswordHasher  # Requires: pip install argon2-cffi
+    from argon2.exceptions import VerifyMismatchError
+
+    print("\n=== Hashing with Argon2id (Recommended) ===")
+    argon2_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=4)  # memory_cost is in KiB
+    argon2_password = "Tr0ub4dor&3"
+    argon2_hash = argon2_hasher.hash(argon2_password)  # salt is generated and embedded automatically
+
+    print(f"Argon2 password : {argon2_password}")
+    print(f"Argon2 hash     : {argon2_hash}")
+
+    try:
+        argon2_hasher.verify(argon2_hash, "Tr0ub4dor&3")
+        print("Argon2 password valid!")
+    except VerifyMismatchError:
+        print("Argon2 password invalid!")
+
+    # --- BONUS: Hashing with bcrypt (Legacy) ---
+
+    import bcrypt  # Requires: pip install bcrypt
 
-# --- Example: Hashing a Password ---
+    print("\n=== Hashing with bcrypt (Legacy) ===")
+    bcrypt_password = b"Tr0ub4dor&3"  # Password to hash
+    bcrypt_hash = bcrypt.hashpw(bcrypt_password, bcrypt.gensalt(bcrypt_rounds))
 
-print("=== SHA-256 Hashing with Salt + Pepper ===")
-user_password = "CorrectHorseBatteryStaple"
-salt = generate_salt()
-hash_digest = hash_password(user_password, salt, PEPPER)
+    print(f"bcrypt rounds   : {bcrypt_rounds} (calibrated for this machine)")
+    print(f"bcrypt password : {bcrypt_password.decode()}")
+    print(f"bcrypt hash     : {bcrypt_hash.decode()}")
 
-print(f"Password   : {user_password}")
-print(f"Salt       : {salt}")
-print(f"Hash (SHA) : {hash_digest}")
+    bcrypt_check = b"Tr0ub4dor&3"  # Attempt to verify with same password
+    if bcrypt.checkpw(bcrypt_check, bcrypt_hash):
+        print("bcrypt password valid!")
+    else:
+        print("bcrypt password invalid!")
 
-# --- Example: Verifying Password ---
 
-print("\n=== Verifying the Password ===")
-input_attempt = "CorrectHorseBatteryStaple"  # Same as original password
-is_valid = verify_password(input_attempt, salt, hash_digest, PEPPER)
-print("Password valid!" if is_valid else "Invalid password!")
+if __name__ == "__main__":
+    import argparse
 
-# --- BONUS: Secure Hashing with bcrypt (Recommended) ---
+    parser = argparse.ArgumentParser(description="Password hashing with salt and pepper.")
+    parser.add_argument("--demo", action="store_true", help="print the step-by-step examples instead of benchmarking")
+    args = parser.parse_args()
 
-print("\n=== Hashing with bcrypt (Recommended) ===")
-bcrypt_password = b"Tr0ub4dor&3"  # Password to hash
-bcrypt_hash = bcrypt.hashpw(bcrypt_password, bcrypt.gensalt())
+    # Only checked when run as a script, so importing the module stays cheap
+    _check_sha256_backend()
 
-print(f"bcrypt password : {bcrypt_password.decode()}")
-print(f"bcrypt hash     : {bcrypt_hash.decode()}")
+    # Measured once so the cost factor fits this host's CPU
+    BCRYPT_ROUNDS = calibrate_bcrypt_rounds()
 
-bcrypt_check = b"Tr0ub4dor&3"  # Attempt to verify with same password
-if bcrypt.checkpw(bcrypt_check, bcrypt_hash):
-    print("bcrypt password valid!")
-else:
-    print("bcrypt password invalid!")
+    if args.demo:
+        run_demo(BCRYPT_ROUNDS)
+    else:
+        run_benchmark(BCRYPT_ROUNDS)
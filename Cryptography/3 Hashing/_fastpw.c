@@ -0,0 +1,89 @@
+/*
+ * Optional C accelerator for "4 Hashing Passwords.py".
+ *
+ * _fastpw.hash(pepper, salt, password) returns SHA-256(pepper + salt + password)
+ * in a single Python call. It uses OpenSSL's EVP interface, which selects the
+ * SHA-NI code path at runtime on CPUs that support it. For inputs this short the
+ * Python call overhead can cost more than the hash itself, so this avoids the
+ * hash object copy, the update() method calls and the digest() call per password.
+ * The GIL is released while hashing, so verify_batch threads can run in parallel.
+ *
+ * Build (Linux/macOS, from this directory):
+ *   gcc -O2 -shared -fPIC $(python3-config --includes) _fastpw.c \
+ *       -o _fastpw$(python3-config --extension-suffix) -lcrypto
+ *
+ * If the module is not built, the Python script falls back to hashlib.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <openssl/evp.h>
+
+static PyObject *
+fastpw_hash(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    Py_buffer parts[3];
+    unsigned char digest[EVP_MAX_MD_SIZE];
+    unsigned int digest_len = 0;
+    int acquired = 0;
+    int ok = 0;
+    EVP_MD_CTX *ctx;
+
+    if (nargs != 3) {
+        PyErr_SetString(PyExc_TypeError,
+                        "hash() takes exactly 3 arguments (pepper, salt, password)");
+        return NULL;
+    }
+    for (; acquired < 3; acquired++) {
+        if (PyObject_GetBuffer(args[acquired], &parts[acquired], PyBUF_SIMPLE) < 0) {
+            goto done;
+        }
+    }
+
+    ctx = EVP_MD_CTX_new();
+    if (ctx == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    Py_BEGIN_ALLOW_THREADS
+    ok = EVP_DigestInit_ex(ctx, EVP_sha256(), NULL)
+         && EVP_DigestUpdate(ctx, parts[0].buf, (size_t)parts[0].len)
+         && EVP_DigestUpdate(ctx, parts[1].buf, (size_t)parts[1].len)
+         && EVP_DigestUpdate(ctx, parts[2].buf, (size_t)parts[2].len)
+         && EVP_DigestFinal_ex(ctx, digest, &digest_len);
+    Py_END_ALLOW_THREADS
+    EVP_MD_CTX_free(ctx);
+    if (!ok) {
+        PyErr_SetString(PyExc_RuntimeError, "OpenSSL SHA-256 computation failed");
+    }
+
+done:
+    while (acquired > 0) {
+        PyBuffer_Release(&parts[--acquired]);
+    }
+    if (!ok) {
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize((const char *)digest, digest_len);
+}
+
+static PyMethodDef fastpw_methods[] = {
+    {"hash", (PyCFunction)(void (*)(void))fastpw_hash, METH_FASTCALL,
+     "hash(pepper, salt, password) -> bytes\n\n"
+     "Return the raw SHA-256 digest of pepper + salt + password."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef fastpw_module = {
+    PyModuleDef_HEAD_INIT,
+    "_fastpw",
+    "SHA-256 of pepper + salt + password in a single C call.",
+    -1,
+    fastpw_methods
+};
+
+PyMODINIT_FUNC
+PyInit__fastpw(void)
+{
+    return PyModule_Create(&fastpw_module);
+}